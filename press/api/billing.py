@@ -27,6 +27,7 @@ from press.utils import get_current_team
 from press.utils.billing import (
 	GSTIN_FORMAT,
 	clear_setup_intent,
+	convert_to_smallest_unit,
 	get_publishable_key,
 	get_razorpay_client,
 	get_setup_intent,
@@ -237,7 +238,7 @@ def create_payment_intent_for_micro_debit(payment_method_name):
 	amount = frappe.db.get_single_value("Press Settings", micro_debit_charge_field)
 
 	intent = stripe.PaymentIntent.create(
-		amount=int(amount * 100),
+		amount=convert_to_smallest_unit(amount),
 		currency=team.currency.lower(),
 		customer=team.stripe_customer_id,
 		description="Micro-Debit Card Test Charge",
@@ -264,7 +265,7 @@ def create_payment_intent_for_partnership_fees():
 
 	stripe = get_stripe()
 	intent = stripe.PaymentIntent.create(
-		amount=int(fee_amount * 100),
+		amount=convert_to_smallest_unit(fee_amount),
 		currency=team.currency.lower(),
 		customer=team.stripe_customer_id,
 		description="Partnership Fee",
@@ -293,7 +294,7 @@ def create_payment_intent_for_buying_credits(amount):
 	amount = round(amount, 2)
 	stripe = get_stripe()
 	intent = stripe.PaymentIntent.create(
-		amount=int(amount * 100),
+		amount=convert_to_smallest_unit(amount),
 		currency=team.currency.lower(),
 		customer=team.stripe_customer_id,
 		description="Prepaid Credits",
@@ -315,7 +316,7 @@ def create_payment_intent_for_prepaid_app(amount, metadata):
 	try:
 		if not payment_method:
 			intent = stripe.PaymentIntent.create(
-				amount=amount * 100,
+				amount=convert_to_smallest_unit(amount),
 				currency=team.currency.lower(),
 				customer=team.stripe_customer_id,
 				description="Prepaid App Purchase",
@@ -323,7 +324,7 @@ def create_payment_intent_for_prepaid_app(amount, metadata):
 			)
 		else:
 			intent = stripe.PaymentIntent.create(
-				amount=amount * 100,
+				amount=convert_to_smallest_unit(amount),
 				currency=team.currency.lower(),
 				customer=team.stripe_customer_id,
 				description="Prepaid App Purchase",
@@ -629,7 +630,7 @@ def create_razorpay_order(amount, type=None):
 
 	amount = round(amount, 2)
 	data = {
-		"amount": int(amount * 100),
+		"amount": convert_to_smallest_unit(amount),
 		"currency": team.currency,
 		"notes": {
 			"Description": "Order for Frappe Cloud Prepaid Credits",
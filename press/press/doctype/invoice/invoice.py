@@ -14,6 +14,7 @@ from press.api.client import dashboard_whitelist
 from press.utils import log_error
 from press.utils.billing import (
 	convert_stripe_money,
+	convert_to_smallest_unit,
 	get_frappe_io_connection,
 	get_gateway_details,
 	get_partner_external_connection,
@@ -171,22 +172,42 @@ class Invoice(Document):
 
 	def get_doc(self, doc):
 		doc.invoice_pdf = self.invoice_pdf or (self.currency == "USD" and self.get_pdf())
-		currency = frappe.get_value("Team", self.team, "currency")
+		currency = frappe.get_cached_value("Team", self.team, "currency")
 		price_field = "price_inr" if currency == "INR" else "price_usd"
 		currency_symbol = "₹" if currency == "INR" else "$"
 
+		# fetch titles and plan prices in bulk instead of querying for every item
+		titles = {}
+		for document_type in ("Server", "Database Server", "Marketplace App"):
+			names = {item.document_name for item in doc["items"] if item.document_type == document_type}
+			titles[document_type] = self._get_field_map(document_type, names, "title")
+
+		server_plans = {
+			item.plan for item in doc["items"] if item.document_type in ("Server", "Database Server")
+		}
+		app_plans = {item.plan for item in doc["items"] if item.document_type == "Marketplace App"}
+		server_plan_prices = self._get_field_map("Server Plan", server_plans, price_field)
+		storage_plan_prices = self._get_field_map("Server Storage Plan", server_plans, price_field)
+		app_plan_prices = self._get_field_map("Marketplace App Plan", app_plans, price_field)
+
 		for item in doc["items"]:
 			if item.document_type in ("Server", "Database Server"):
-				item.document_name = frappe.get_value(item.document_type, item.document_name, "title")
-				if server_plan := frappe.get_value("Server Plan", item.plan, price_field):
+				item.document_name = titles[item.document_type].get(item.document_name)
+				if server_plan := server_plan_prices.get(item.plan):
 					item.plan = f"{currency_symbol}{server_plan}"
-				elif server_plan := frappe.get_value("Server Storage Plan", item.plan, price_field):
+				elif server_plan := storage_plan_prices.get(item.plan):
 					item.plan = f"Storage Add-on {currency_symbol}{server_plan}/GB"
 			elif item.document_type == "Marketplace App":
-				item.document_name = frappe.get_value(item.document_type, item.document_name, "title")
-				item.plan = (
-					f"{currency_symbol}{frappe.get_value('Marketplace App Plan', item.plan, price_field)}"
-				)
+				item.document_name = titles[item.document_type].get(item.document_name)
+				item.plan = f"{currency_symbol}{app_plan_prices.get(item.plan)}"
+
+	@staticmethod
+	def _get_field_map(doctype, names, field):
+		names = [name for name in names if name]
+		if not names:
+			return {}
+		rows = frappe.get_all(doctype, filters={"name": ("in", names)}, fields=["name", field])
+		return {row.name: row[field] for row in rows}
 
 	@dashboard_whitelist()
 	def stripe_payment_url(self):
@@ -246,14 +267,16 @@ class Invoice(Document):
 			self.save()
 			return
 
+		stripe_invoice = None
 		if self.stripe_invoice_id:
 			# if stripe invoice is already created and paid,
 			# then update status and return early
+			# payment intent is expanded so that it can be reused below without another request
 			stripe = get_stripe()
-			invoice = stripe.Invoice.retrieve(self.stripe_invoice_id)
-			if invoice.status == "paid":
+			stripe_invoice = stripe.Invoice.retrieve(self.stripe_invoice_id, expand=["payment_intent"])
+			if stripe_invoice.status == "paid":
 				self.status = "Paid"
-				self.update_transaction_details(invoice.charge)
+				self.update_transaction_details(stripe_invoice.charge)
 				self.submit()
 				self.unsuspend_sites_if_applicable()
 				return
@@ -268,10 +291,8 @@ class Invoice(Document):
 		if self.amount_due == 0:
 			self.status = "Paid"
 
-		if self.status == "Paid" and self.stripe_invoice_id and self.amount_paid == 0:
-			stripe = get_stripe()
-			invoice = stripe.Invoice.retrieve(self.stripe_invoice_id)
-			payment_intent = stripe.PaymentIntent.retrieve(invoice.payment_intent)
+		if self.status == "Paid" and stripe_invoice and self.amount_paid == 0:
+			payment_intent = stripe_invoice.payment_intent
 			if payment_intent.status == "processing":
 				# mark the fc invoice as Paid
 				# if the payment intent is processing, it means the invoice cannot be voided yet
@@ -321,10 +342,7 @@ class Invoice(Document):
 			team.unsuspend_sites(f"Invoice {self.name} Payment Successful.")
 
 	def calculate_total(self):
-		total = 0
-		for item in self.items:
-			total += item.amount
-		self.total = flt(total, 2)
+		self.total = flt(sum(item.amount or 0 for item in self.items), 2)
 
 	def apply_taxes_if_applicable(self):
 		self.amount_due_with_tax = self.amount_due
@@ -399,12 +417,13 @@ class Invoice(Document):
 		if self.amount_due_with_tax <= 0:
 			return
 
-		customer_id = frappe.db.get_value("Team", self.team, "stripe_customer_id")
-		amount = int(self.amount_due_with_tax * 100)
+		customer_id = frappe.get_cached_value("Team", self.team, "stripe_customer_id")
+		amount = convert_to_smallest_unit(self.amount_due_with_tax)
 		self._make_stripe_invoice(customer_id, amount)
 
 	def _make_stripe_invoice(self, customer_id, amount):
 		mandate_id = self.get_mandate_id(customer_id)
+		currency = self.currency.lower()
 		try:
 			stripe = get_stripe()
 			invoice = stripe.Invoice.create(
@@ -412,7 +431,7 @@ class Invoice(Document):
 				pending_invoice_items_behavior="exclude",
 				collection_method="charge_automatically",
 				auto_advance=True,
-				currency=self.currency.lower(),
+				currency=currency,
 				payment_settings={"default_mandate": mandate_id},
 				idempotency_key=f"invoice:{self.name}:amount:{amount}",
 			)
@@ -421,9 +440,10 @@ class Invoice(Document):
 				invoice=invoice["id"],
 				description=self.get_stripe_invoice_item_description(),
 				amount=amount,
-				currency=self.currency.lower(),
+				currency=currency,
 				idempotency_key=f"invoiceitem:{self.name}:amount:{amount}",
 			)
+			# db_set also updates the in-memory doc, no need to reload it afterwards
 			self.db_set(
 				{
 					"stripe_invoice_id": invoice["id"],
@@ -431,7 +451,6 @@ class Invoice(Document):
 				},
 				commit=True,
 			)
-			self.reload()
 			return invoice
 		except Exception:
 			frappe.db.rollback()
@@ -456,7 +475,9 @@ class Invoice(Document):
 		# if stripe invoice was created, find it and set it
 		# so that we avoid scenarios where Stripe Invoice was created but not set in Frappe Cloud
 		stripe = get_stripe()
-		invoices = stripe.Invoice.list(customer=frappe.db.get_value("Team", self.team, "stripe_customer_id"))
+		invoices = stripe.Invoice.list(
+			customer=frappe.get_cached_value("Team", self.team, "stripe_customer_id")
+		)
 		description = self.get_stripe_invoice_item_description()
 		for invoice in invoices.data:
 			line_items = invoice.lines.data
@@ -468,7 +489,7 @@ class Invoice(Document):
 	def get_stripe_invoice_item_description(self):
 		start = getdate(self.period_start)
 		end = getdate(self.period_end)
-		period_string = f"{start.strftime('%b %d')} - {end.strftime('%b %d')} {end.year}"
+		period_string = f"{start:%b %d} - {end:%b %d %Y}"
 		return f"Frappe Cloud Subscription ({period_string})"
 
 	@frappe.whitelist()
@@ -477,26 +498,29 @@ class Invoice(Document):
 		stripe.Invoice.finalize_invoice(self.stripe_invoice_id)
 
 	def validate_duplicate(self):
-		invoice_exists = frappe.db.exists(
-			"Invoice",
-			{
-				"stripe_payment_intent_id": self.stripe_payment_intent_id,
-				"type": "Prepaid Credits",
-				"name": ("!=", self.name),
-			},
-		)
-		if self.type == "Prepaid Credits" and self.stripe_payment_intent_id and invoice_exists:
-			frappe.throw("Invoice with same Stripe payment intent exists", frappe.DuplicateEntryError)
-
-		if self.type == "Subscription" and self.period_start and self.period_end and self.is_new():
-			query = (
-				f"select `name` from `tabInvoice` where team = '{self.team}' and"
-				f" status = 'Draft' and ('{self.period_start}' between `period_start` and"
-				f" `period_end` or '{self.period_end}' between `period_start` and"
-				" `period_end`)"
+		if self.type == "Prepaid Credits" and self.stripe_payment_intent_id:
+			invoice_exists = frappe.db.exists(
+				"Invoice",
+				{
+					"stripe_payment_intent_id": self.stripe_payment_intent_id,
+					"type": "Prepaid Credits",
+					"name": ("!=", self.name),
+				},
 			)
+			if invoice_exists:
+				frappe.throw("Invoice with same Stripe payment intent exists", frappe.DuplicateEntryError)
 
-			intersecting_invoices = [x[0] for x in frappe.db.sql(query, as_list=True)]
+		if self.type == "Subscription" and self.period_start and self.period_end and self.is_new():
+			query = """
+				select `name` from `tabInvoice`
+				where team = %(team)s and status = 'Draft'
+				and (
+					%(period_start)s between `period_start` and `period_end`
+					or %(period_end)s between `period_start` and `period_end`
+				)
+			"""
+			values = {"team": self.team, "period_start": self.period_start, "period_end": self.period_end}
+			intersecting_invoices = [x[0] for x in frappe.db.sql(query, values, as_list=True)]
 
 			if intersecting_invoices:
 				frappe.throw(
@@ -505,7 +529,11 @@ class Invoice(Document):
 				)
 
 	def validate_team(self):
-		team = frappe.get_doc("Team", self.team)
+		# validate runs several times per invoice, read from the document cache
+		# instead of loading Team with all its child tables every time
+		team = frappe.get_cached_value(
+			"Team", self.team, ["billing_name", "user", "currency", "payment_mode"], as_dict=True
+		)
 
 		self.customer_name = team.billing_name or frappe.utils.get_fullname(self.team)
 		self.customer_email = (
@@ -522,9 +550,8 @@ class Invoice(Document):
 		if not self.period_start:
 			return
 		if not self.period_end:
-			period_start = getdate(self.period_start)
 			# period ends on last day of month
-			self.period_end = frappe.utils.get_last_day(period_start)
+			self.period_end = frappe.utils.get_last_day(self.period_start)
 
 		# due date
 		self.due_date = self.period_end
@@ -635,7 +662,7 @@ class Invoice(Document):
 			self.remove(item)
 
 	def compute_free_credits(self):
-		self.free_credits = sum([d.amount for d in self.credit_allocations if d.source == "Free Credits"])
+		self.free_credits = sum(d.amount for d in self.credit_allocations if d.source == "Free Credits")
 
 	def calculate_discounts(self):
 		for item in self.items:
@@ -848,9 +875,10 @@ class Invoice(Document):
 		if not stripe_charge:
 			return
 		stripe = get_stripe()
-		charge = stripe.Charge.retrieve(stripe_charge)
+		# expand balance transaction in the same request instead of retrieving it separately
+		charge = stripe.Charge.retrieve(stripe_charge, expand=["balance_transaction"])
 		if charge.balance_transaction:
-			balance_transaction = stripe.BalanceTransaction.retrieve(charge.balance_transaction)
+			balance_transaction = charge.balance_transaction
 			self.exchange_rate = balance_transaction.exchange_rate
 			self.transaction_amount = convert_stripe_money(balance_transaction.amount)
 			self.transaction_net = convert_stripe_money(balance_transaction.net)
@@ -1010,18 +1038,35 @@ def finalize_draft_invoices():
 			"period_end": ("<=", today),
 			"team": ("in", enabled_teams),
 		},
-		pluck="name",
+		fields=["name", "team", "period_end"],
 		limit=500,
 		order_by="total desc",
 	)
 
 	current_time = frappe.utils.get_datetime().time()
 	today = frappe.utils.getdate()
-	for name in invoices:
-		invoice = frappe.get_doc("Invoice", name)
+	invoices_by_team = {}
+	for invoice in invoices:
 		# don't finalize if invoice ends today and time is before 6 PM
+		# checked before loading the doc so skipped invoices cost nothing
 		if invoice.period_end == today and current_time.hour < 18:
 			continue
+		invoices_by_team.setdefault(invoice.team, []).append(invoice.name)
+
+	# finalize in parallel across workers, but keep invoices of the same team in one job
+	# so that credit balance allocation for a team never runs concurrently
+	for team, team_invoices in invoices_by_team.items():
+		frappe.enqueue(
+			"press.press.doctype.invoice.invoice.finalize_draft_invoices_of_team",
+			invoices=team_invoices,
+			queue="long",
+			job_id=f"finalize_draft_invoices:{team}",
+			deduplicate=True,
+		)
+
+
+def finalize_draft_invoices_of_team(invoices):
+	for invoice in invoices:
 		finalize_draft_invoice(invoice)
 
 
@@ -1038,17 +1083,16 @@ def finalize_unpaid_prepaid_credit_invoices():
 			"period_end": ("<=", today),
 			"payment_mode": "Prepaid Credits",
 		},
-		pluck="name",
+		fields=["name", "period_end"],
 	)
 
 	current_time = frappe.utils.get_datetime().time()
 	today = frappe.utils.getdate()
-	for name in invoices:
-		invoice = frappe.get_doc("Invoice", name)
+	for invoice in invoices:
 		# don't finalize if invoice ends today and time is before 6 PM
 		if invoice.period_end == today and current_time.hour < 18:
 			continue
-		finalize_draft_invoice(invoice)
+		finalize_draft_invoice(invoice.name)
 
 
 def finalize_draft_invoice(invoice):
@@ -1153,3 +1197,8 @@ def create_sales_invoice_on_external_site(transaction_response):
 			frappe.throw(_("Failed to create Sales Invoice on external site."))
 	except Exception as e:
 		frappe.log_error(str(e), "Error creating Sales Invoice on external site")
+
+
+def on_doctype_update():
+	frappe.db.add_index("Invoice", ["team", "period_start", "period_end"])
+	frappe.db.add_index("Invoice", ["status", "type", "period_end"])
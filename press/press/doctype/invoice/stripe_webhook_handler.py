@@ -1,6 +1,8 @@
 # Copyright (c) 2021, Frappe Technologies Pvt. Ltd. and Contributors
 # For license information, please see license.txt
 
+import json
+
 import frappe
 
 from press.utils import log_error
@@ -26,7 +28,7 @@ class StripeWebhookHandler:
 
 	def process(self):
 		if self.webhook_log.event_type in DISPUTE_EVENT_TYPE_MAP:
-			event = frappe.parse_json(self.webhook_log.payload)
+			event = json.loads(self.webhook_log.payload)
 			id = event["data"]["object"]["id"]
 			payment_intent = event["data"]["object"]["payment_intent"]
 			email = event["data"]["object"]["evidence"]["customer_email_address"]
@@ -52,7 +54,7 @@ class StripeWebhookHandler:
 		if self.webhook_log.event_type not in EVENT_TYPE_MAP:
 			return
 
-		event = frappe.parse_json(self.webhook_log.payload)
+		event = json.loads(self.webhook_log.payload)
 		stripe_invoice = event["data"]["object"]
 
 		if not frappe.db.exists("Invoice", {"stripe_invoice_id": stripe_invoice["id"]}):
@@ -612,3 +612,170 @@ class TestInvoice(unittest.TestCase):
 			frappe.db.delete("Team", team.name)
 			frappe.db.delete("Balance Transaction", {"team": team.name})
 			frappe.db.commit()
+
+	@patch("press.press.doctype.invoice.invoice.frappe.enqueue")
+	def test_finalize_draft_invoices_enqueues_one_job_per_team(self, mock_enqueue):
+		from press.press.doctype.invoice.invoice import finalize_draft_invoices
+
+		other_team = create_test_team()
+		first, second, other = [
+			frappe.get_doc(
+				doctype="Invoice",
+				team=team,
+				period_start=add_days(today(), start),
+				period_end=add_days(today(), end),
+			).insert()
+			for team, start, end in [
+				(self.team.name, -20, -11),
+				(self.team.name, -10, -1),
+				(other_team.name, -10, -1),
+			]
+		]
+
+		finalize_draft_invoices()
+
+		jobs = {call.kwargs["job_id"]: call for call in mock_enqueue.call_args_list}
+		team_job = jobs[f"finalize_draft_invoices:{self.team.name}"]
+		self.assertEqual(
+			team_job.args[0], "press.press.doctype.invoice.invoice.finalize_draft_invoices_of_team"
+		)
+		self.assertEqual(sorted(team_job.kwargs["invoices"]), sorted([first.name, second.name]))
+		self.assertEqual(team_job.kwargs["queue"], "long")
+		self.assertTrue(team_job.kwargs["deduplicate"])
+		self.assertEqual(jobs[f"finalize_draft_invoices:{other_team.name}"].kwargs["invoices"], [other.name])
+
+	@patch("press.press.doctype.invoice.invoice.frappe.enqueue")
+	def test_finalize_draft_invoices_skips_invoices_ending_today_before_6_pm(self, mock_enqueue):
+		from press.press.doctype.invoice.invoice import finalize_draft_invoices
+
+		ended = frappe.get_doc(
+			doctype="Invoice",
+			team=self.team.name,
+			period_start=add_days(today(), -20),
+			period_end=add_days(today(), -11),
+		).insert()
+		frappe.get_doc(
+			doctype="Invoice",
+			team=self.team.name,
+			period_start=add_days(today(), -5),
+			period_end=today(),
+		).insert()
+
+		morning = frappe.utils.get_datetime(f"{today()} 10:00:00")
+		with patch("press.press.doctype.invoice.invoice.frappe.utils.get_datetime", return_value=morning):
+			finalize_draft_invoices()
+
+		jobs = {call.kwargs["job_id"]: call for call in mock_enqueue.call_args_list}
+		self.assertEqual(jobs[f"finalize_draft_invoices:{self.team.name}"].kwargs["invoices"], [ended.name])
+
+	@patch("press.press.doctype.invoice.invoice.frappe.db.commit", new=Mock())
+	def test_finalize_draft_invoices_of_team(self):
+		from press.press.doctype.invoice.invoice import finalize_draft_invoices_of_team
+
+		invoices = []
+		for start, end in [(-20, -11), (-10, -1)]:
+			invoice = frappe.get_doc(
+				doctype="Invoice",
+				team=self.team.name,
+				period_start=add_days(today(), start),
+				period_end=add_days(today(), end),
+			).insert()
+			invoice.append("items", {"quantity": 1, "rate": 0, "amount": 0})
+			invoice.save()
+			invoices.append(invoice.name)
+
+		finalize_draft_invoices_of_team(invoices)
+
+		for name in invoices:
+			self.assertEqual(frappe.db.get_value("Invoice", name, "status"), "Empty")
+
+	def _finalize_credits_covered_invoice_with_stripe_invoice(self, payment_intent_status):
+		invoice = frappe.get_doc(
+			doctype="Invoice",
+			team=self.team.name,
+			period_start=today(),
+			period_end=add_days(today(), 10),
+			stripe_invoice_id="in_test",
+		)
+		invoice.append("items", {"quantity": 1, "rate": 60, "amount": 60})
+		invoice.insert()
+		self.team.allocate_credit_amount(70, source="Free Credits")
+
+		stripe_invoice = Mock(status="open", payment_intent=Mock(status=payment_intent_status))
+		with patch("press.press.doctype.invoice.invoice.get_stripe") as mock_get_stripe:
+			mock_get_stripe.return_value.Invoice.retrieve.return_value = stripe_invoice
+			with patch.object(invoice, "change_stripe_invoice_status") as mock_change_status:
+				invoice.finalize_invoice()
+
+		mock_get_stripe.return_value.Invoice.retrieve.assert_called_once_with(
+			"in_test", expand=["payment_intent"]
+		)
+		mock_get_stripe.return_value.PaymentIntent.retrieve.assert_not_called()
+		self.assertEqual(invoice.status, "Paid")
+		return mock_change_status
+
+	def test_finalize_invoice_voids_stripe_invoice_paid_by_credits(self):
+		mock_change_status = self._finalize_credits_covered_invoice_with_stripe_invoice(
+			"requires_payment_method"
+		)
+		mock_change_status.assert_called_once_with("Void")
+
+	def test_finalize_invoice_does_not_void_stripe_invoice_with_processing_payment(self):
+		mock_change_status = self._finalize_credits_covered_invoice_with_stripe_invoice("processing")
+		mock_change_status.assert_not_called()
+
+	def _render_dashboard_items(self, team):
+		records = {
+			"Server": {"f1-server": {"title": "Server One"}},
+			"Database Server": {"m1-server": {"title": "Database One"}},
+			"Marketplace App": {"test-app": {"title": "Test App"}},
+			"Server Plan": {"server-plan": {"price_inr": 1000, "price_usd": 12}},
+			"Server Storage Plan": {"Add-on Storage plan": {"price_inr": 5, "price_usd": 0.1}},
+			"Marketplace App Plan": {"app-plan": {"price_inr": 100, "price_usd": 2}},
+		}
+
+		def get_all(doctype, filters, fields):
+			field = fields[1]
+			return [
+				frappe._dict({"name": n, field: records[doctype][n][field]})
+				for n in filters["name"][1]
+				if n in records[doctype]
+			]
+
+		invoice = frappe.get_doc(doctype="Invoice", team=team.name, invoice_pdf="/files/test.pdf")
+		doc = frappe._dict(
+			items=[
+				frappe._dict(document_type="Server", document_name="f1-server", plan="server-plan"),
+				frappe._dict(
+					document_type="Database Server", document_name="m1-server", plan="Add-on Storage plan"
+				),
+				frappe._dict(document_type="Marketplace App", document_name="test-app", plan="app-plan"),
+				frappe._dict(document_type="Site", document_name="test.frappe.cloud", plan="site-plan"),
+			]
+		)
+		with patch("press.press.doctype.invoice.invoice.frappe.get_all", side_effect=get_all):
+			invoice.get_doc(doc)
+		return [(item.document_name, item.plan) for item in doc["items"]]
+
+	def test_get_doc_renders_item_titles_and_plans_in_inr(self):
+		self.assertEqual(
+			self._render_dashboard_items(self.team),
+			[
+				("Server One", "₹1000"),
+				("Database One", "Storage Add-on ₹5/GB"),
+				("Test App", "₹100"),
+				("test.frappe.cloud", "site-plan"),
+			],
+		)
+
+	def test_get_doc_renders_item_titles_and_plans_in_usd(self):
+		team = create_test_team(country="United States")
+		self.assertEqual(
+			self._render_dashboard_items(team),
+			[
+				("Server One", "$12"),
+				("Database One", "Storage Add-on $0.1/GB"),
+				("Test App", "$2"),
+				("test.frappe.cloud", "site-plan"),
+			],
+		)
@@ -42,14 +42,14 @@ class StripePaymentEvent(Document):
 			return
 		stripe_invoice = frappe.parse_json(self.stripe_invoice_object)
 
-		invoice.update(
+		# only payment fields change here, write them in a single UPDATE instead of a full save
+		invoice.db_set(
 			{
 				"amount_paid": convert_stripe_money(stripe_invoice["amount_paid"]),
 				"stripe_invoice_url": stripe_invoice["hosted_invoice_url"],
 				"status": self.payment_status,
 			}
 		)
-		invoice.save()
 
 	def handle_payment_succeeded(self):
 		invoice = frappe.get_doc("Invoice", self.invoice, for_update=True)
@@ -73,7 +73,6 @@ class StripePaymentEvent(Document):
 			)
 			return
 		stripe_invoice = frappe.parse_json(self.stripe_invoice_object)
-		team = frappe.get_doc("Team", self.team)
 
 		invoice.update(
 			{
@@ -96,7 +95,7 @@ class StripePaymentEvent(Document):
 			frappe.db.count(
 				"Invoice",
 				{
-					"team": team.name,
+					"team": self.team,
 					"status": "Unpaid",
 					"type": "Subscription",
 					"docstatus": ("<", 2),
@@ -105,6 +104,7 @@ class StripePaymentEvent(Document):
 			== 0
 		):
 			# unsuspend sites only if all invoices are paid
+			team = frappe.get_cached_doc("Team", self.team)
 			team.unsuspend_sites(reason=f"Unsuspending sites because of successful payment of {self.invoice}")
 
 	def handle_payment_failed(self):
@@ -134,11 +134,10 @@ class StripePaymentEvent(Document):
 		if attempt_date:
 			attempt_date = datetime.fromtimestamp(attempt_date)
 		attempt_count = stripe_invoice.get("attempt_count")
-		invoice.update(
+		invoice.db_set(
 			{
 				"payment_attempt_count": attempt_count,
 				"payment_attempt_date": attempt_date,
 				"status": "Unpaid",
 			}
 		)
-		invoice.save()
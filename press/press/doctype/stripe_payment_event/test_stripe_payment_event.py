@@ -1,9 +1,76 @@
 # Copyright (c) 2021, Frappe and Contributors
 # See license.txt
 
-# import frappe
 import unittest
+from datetime import datetime
+
+import frappe
+from frappe.utils import add_days, get_datetime, today
+
+from press.press.doctype.team.test_team import create_test_team
 
 
 class TestStripePaymentEvent(unittest.TestCase):
-	pass
+	def setUp(self):
+		self.team = create_test_team()
+		self.invoice = frappe.get_doc(
+			doctype="Invoice",
+			team=self.team.name,
+			period_start=today(),
+			period_end=add_days(today(), 10),
+			stripe_invoice_id="in_test",
+		)
+		self.invoice.append("items", {"quantity": 1, "rate": 100, "amount": 100})
+		self.invoice.insert()
+		# move modified to the past so that the update by the event is visible
+		self.old_modified = get_datetime("2020-01-01 00:00:00")
+		frappe.db.set_value(
+			"Invoice", self.invoice.name, "modified", self.old_modified, update_modified=False
+		)
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def create_event(self, event_type, payment_status, stripe_invoice):
+		return frappe.get_doc(
+			{
+				"doctype": "Stripe Payment Event",
+				"invoice": self.invoice.name,
+				"team": self.team.name,
+				"event_type": event_type,
+				"payment_status": payment_status,
+				"stripe_invoice_object": frappe.as_json(stripe_invoice),
+				"stripe_invoice_id": "in_test",
+			}
+		).insert()
+
+	def test_finalized_event_updates_invoice(self):
+		self.create_event(
+			"Finalized",
+			"Paid",
+			{"id": "in_test", "amount_paid": 10000, "hosted_invoice_url": "https://invoice.stripe.com/test"},
+		)
+
+		invoice = frappe.get_doc("Invoice", self.invoice.name)
+		self.assertEqual(invoice.status, "Paid")
+		self.assertEqual(invoice.amount_paid, 100)
+		self.assertEqual(invoice.stripe_invoice_url, "https://invoice.stripe.com/test")
+		self.assertGreater(get_datetime(invoice.modified), self.old_modified)
+
+	def test_failed_event_updates_invoice(self):
+		attempted_at = datetime(2024, 1, 15, 10, 30)
+		self.create_event(
+			"Failed",
+			"Unpaid",
+			{
+				"id": "in_test",
+				"attempt_count": 2,
+				"webhooks_delivered_at": int(attempted_at.timestamp()),
+			},
+		)
+
+		invoice = frappe.get_doc("Invoice", self.invoice.name)
+		self.assertEqual(invoice.status, "Unpaid")
+		self.assertEqual(invoice.payment_attempt_count, 2)
+		self.assertEqual(invoice.payment_attempt_date, attempted_at.date())
+		self.assertGreater(get_datetime(invoice.modified), self.old_modified)
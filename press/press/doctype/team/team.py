@@ -2,6 +2,7 @@
 # For license information, please see license.txt
 from __future__ import annotations
 
+import json
 import os
 from hashlib import blake2b
 
@@ -1187,7 +1188,12 @@ class Team(Document):
 
 	@frappe.whitelist()
 	def send_email_for_failed_payment(self, invoice, sites=None):
-		invoice = frappe.get_doc("Invoice", invoice)
+		# only a few scalar fields are needed, avoid loading the invoice with all its items
+		invoice = frappe.db.get_value(
+			"Invoice", invoice, ["stripe_invoice_url", "amount_due", "currency"], as_dict=True
+		)
+		if not invoice:
+			frappe.throw("Invoice not found", frappe.DoesNotExistError)
 		email = (
 			frappe.db.get_value("Communication Email", {"parent": self.name, "type": "invoices"}, "value")
 			or self.user
@@ -1204,7 +1210,7 @@ class Team(Document):
 			args={
 				"subject": subject,
 				"payment_link": invoice.stripe_invoice_url,
-				"amount": invoice.get_formatted("amount_due"),
+				"amount": frappe.utils.fmt_money(invoice.amount_due, currency=invoice.currency),
 				"account_update_link": account_update_link,
 				"last_4": last_4 or "",
 				"card_not_added": not payment_method,
@@ -1286,7 +1292,7 @@ def process_stripe_webhook(doc, method):
 	if doc.event_type not in ["payment_intent.succeeded"]:
 		return
 
-	event = frappe.parse_json(doc.payload)
+	event = json.loads(doc.payload)
 	payment_intent = event["data"]["object"]
 	if payment_intent.get("invoice"):
 		# ignore payment for invoice
@@ -81,3 +81,31 @@ class TestTeam(unittest.TestCase):
 				account_request2, "John", "Meyer", "jonmeyer@gmail.com", country="Pakistan"
 			)
 		self.assertEqual(team2.currency, "USD")
+
+	def test_send_email_for_failed_payment(self):
+		team = create_test_team()
+		invoice = frappe.get_doc(
+			doctype="Invoice",
+			team=team.name,
+			period_start=frappe.utils.today(),
+			period_end=frappe.utils.add_days(frappe.utils.today(), 10),
+			stripe_invoice_url="https://invoice.stripe.com/test",
+		)
+		invoice.append("items", {"quantity": 1, "rate": 1234.5, "amount": 1234.5})
+		invoice.insert()
+
+		with patch("press.press.doctype.team.team.frappe.sendmail") as mock_sendmail:
+			team.send_email_for_failed_payment(invoice.name)
+
+		args = mock_sendmail.call_args.kwargs["args"]
+		self.assertEqual(args["payment_link"], "https://invoice.stripe.com/test")
+		# amount text must match what the email rendered from the full invoice doc before
+		self.assertEqual(args["amount"], invoice.get_formatted("amount_due"))
+
+	def test_send_email_for_failed_payment_with_unknown_invoice(self):
+		team = create_test_team()
+		with patch("press.press.doctype.team.team.frappe.sendmail") as mock_sendmail:
+			self.assertRaises(
+				frappe.DoesNotExistError, team.send_email_for_failed_payment, "non-existent-invoice"
+			)
+		mock_sendmail.assert_not_called()
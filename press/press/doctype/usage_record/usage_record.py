@@ -125,3 +125,4 @@ def link_unlinked_usage_records():
 
 def on_doctype_update():
 	frappe.db.add_index("Usage Record", ["subscription", "date"])
+	frappe.db.add_index("Usage Record", ["invoice"])
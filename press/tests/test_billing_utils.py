@@ -1,8 +1,10 @@
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
 
 import frappe
 
-from press.api.billing import validate_gst
+from press.api.billing import create_payment_intent_for_prepaid_app, validate_gst
+from press.utils.billing import convert_to_smallest_unit
 
 VALID_GSTINS = [
 	{"gstin": "27AALFV4847R1Z2", "state": "Maharashtra", "country": "India"},
@@ -35,3 +37,24 @@ class TestBillingUtils(TestCase):
 			self.assertIsNone(
 				validate_gst(obj), f"{obj} has a valid GSTIN, but the validate function throws!"
 			)
+
+	def test_convert_to_smallest_unit(self):
+		self.assertEqual(convert_to_smallest_unit(19.99), 1999)
+		self.assertEqual(convert_to_smallest_unit(0.29), 29)
+		self.assertEqual(convert_to_smallest_unit(100), 10000)
+		self.assertEqual(convert_to_smallest_unit(None), 0)
+
+	@patch("press.api.billing.get_publishable_key", new=MagicMock())
+	@patch("press.api.billing.get_current_team")
+	@patch("press.api.billing.get_stripe")
+	def test_prepaid_app_payment_intent_amount_in_cents(self, mock_get_stripe, mock_get_current_team):
+		mock_get_current_team.return_value = frappe._dict(
+			currency="USD", stripe_customer_id="cus_test", default_payment_method=None
+		)
+		create_payment_intent = mock_get_stripe.return_value.PaymentIntent.create
+
+		for payment_method in (None, "pm_test"):
+			create_payment_intent.reset_mock()
+			with patch("press.api.billing.frappe.get_value", return_value=payment_method):
+				create_payment_intent_for_prepaid_app(9.99, {})
+			self.assertEqual(create_payment_intent.call_args.kwargs["amount"], 999)
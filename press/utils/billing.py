@@ -177,6 +177,12 @@ def convert_stripe_money(amount):
 	return (amount / 100) if amount else 0
 
 
+def convert_to_smallest_unit(amount):
+	# amount in cents/paise as expected by payment gateways
+	# round instead of truncating, int(19.99 * 100) is 1998
+	return round(amount * 100) if amount else 0
+
+
 def validate_gstin_check_digit(gstin, label="GSTIN"):
 	"""Function to validate the check digit of the GSTIN."""
 	factor = 1